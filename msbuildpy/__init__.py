@@ -19,14 +19,14 @@
 # ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from .private import finders_entrypoint
 from .searcher import \
     Searcher, \
     ToolEntry, \
     find_msbuild, \
     compile_tool_filter, \
     add_default_finder, \
-    get_default_finders
+    get_default_finders, \
+    clear_finder_caches
 from .version import VersionFilterSyntaxError
 
 __all__ = [
@@ -37,6 +37,7 @@ __all__ = [
     'compile_tool_filter',
     'add_default_finder',
     'get_default_finders',
+    'clear_finder_caches',
 ]
 
 __author__ = 'Teriks'
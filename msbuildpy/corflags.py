@@ -23,10 +23,11 @@
 Contains tools for reading CorFlags from .NET assemblies/executables.
 """
 
+import mmap
+from array import array
 from enum import Enum as Enum
-from struct import unpack
-
-from collections import namedtuple
+from os import fstat as os_fstat
+from struct import Struct
 
 
 class PEFormat(Enum):
@@ -52,9 +53,11 @@ class AssemblyArchitecture(Enum):
     X64 = 2
 
 
-class CorFlagsBits:
+class CorFlagsBits(int):
     """
     Represents PE file's CorFlags section bitfield value.
+    
+    This is an **int** subclass, so bitwise operations against it are plain integer operations.
     """
 
     F32BitsRequired = 2
@@ -62,6 +65,8 @@ class CorFlagsBits:
     StrongNameSigned = 8
     TrackDebugData = 0x10000
 
+    __slots__ = ()
+
     @property
     def value(self):
         """
@@ -69,29 +74,7 @@ class CorFlagsBits:
         
         :return: Integer value of the flags. 
         """
-        return self._value
-
-    def __int__(self):
-        return self._value
-
-    def __or__(self, other):
-        if type(other) is int:
-            return self._value | other
-        return self._value | other._value
-
-    def __and__(self, other):
-        if type(other) is int:
-            return self._value & other
-        return self._value & other._value
-
-    def __init__(self, value):
-        self._value = value
-
-    def __str__(self):
-        return str(self._value)
-
-    def __repr__(self):
-        return str(self._value)
+        return int(self)
 
 
 class CorFlags:
@@ -115,7 +98,7 @@ class CorFlags:
         :return: bool
         """
 
-        return (self._corflags & CorFlagsBits.StrongNameSigned) == CorFlagsBits.StrongNameSigned
+        return bool(self._corflags & CorFlagsBits.StrongNameSigned)
 
     @property
     def is_pure_il(self):
@@ -125,7 +108,7 @@ class CorFlags:
         :return: bool
         """
 
-        return (self._corflags & CorFlagsBits.ILOnly) == CorFlagsBits.ILOnly
+        return bool(self._corflags & CorFlagsBits.ILOnly)
 
     @property
     def processor_architecture(self):
@@ -139,7 +122,7 @@ class CorFlags:
 
         if self._pe_format == PEFormat.PE32Plus:
             return AssemblyArchitecture.X64
-        if (self._corflags & CorFlagsBits.F32BitsRequired) != 0 or not self.is_pure_il:
+        if self._corflags & CorFlagsBits.F32BitsRequired or not self.is_pure_il:
             return AssemblyArchitecture.X86
         return AssemblyArchitecture.MSIL
 
@@ -194,112 +177,137 @@ class CorFlags:
         return self._pe_format
 
 
-_Section = namedtuple('Section', ['virtual_size', 'virtual_address', 'pointer'])
+# UInt32 little-endian
+_U32 = Struct('<I')
+
+# PE signature, then the COFF file header, then the optional header magic.
+# only the number of sections and the optional header size are kept from the COFF header
+_PE_HEADER = Struct('<I2xH12xH2xH')
+
+# section table entry: (skip 8 byte name), virtual size, virtual address,
+# (skip size of raw data), pointer to raw data, (skip the remaining 16 bytes)
+_SECTION_ENTRY = Struct('<8xIIxxxxI16x')
+
+# CLI header, starting after the 4 byte header size: runtime major/minor version,
+# (skip metadata rva and size), flags
+_CLI_HEADER = Struct('<HH8xI')
 
 
-def _resolve_rva(sections, rva):
-    for section in sections:
-        if section.virtual_address <= rva < section.virtual_address + section.virtual_size:
-            return rva - section.virtual_address + section.pointer
+def _resolve_rva(virtual_addresses, virtual_sizes, pointers, rva):
+    # Only one rva is resolved per file, so a linear scan over the section table
+    # is as cheap as anything else.  It also copes with malformed but loadable
+    # files whose sections are not in ascending order, the first section holding
+    # the rva wins.
+
+    for virtual_address, virtual_size, pointer in zip(virtual_addresses, virtual_sizes, pointers):
+        if virtual_address <= rva < virtual_address + virtual_size:
+            return rva - virtual_address + pointer
     return 0
 
 
-def read(stream):
-    """
-    Read :py:class:`msbuildpy.corflags.CorFlags` from a .NET assembly in a file stream.
-    
-    **None** is returned if the PE file is invalid.
-    
-    :param stream: A file stream that supports random access with **seek**
-    
-    :return: :py:class:`msbuildpy.corflags.CorFlags` or **None**
-    """
+def _stream_block_reader(stream):
+    # Returns a function which reads a block from the stream, the block
+    # is returned along with the offset of the requested data inside of it.
 
-    stream.seek(0, 2)
-    length = stream.tell()
-    stream.seek(0)
+    def read_block(offset, size):
+        stream.seek(offset)
+        return stream.read(size), 0
+
+    return read_block
+
+
+def _mmap_block_reader(mm):
+    # The memory map is random access, so blocks are the map itself at the
+    # requested offset.  Nothing is copied until fields are unpacked.
 
+    def read_block(offset, size):
+        return mm, offset
+
+    return read_block
+
+
+def _read(read_block, length):
     if length < 0x40:
         return None
 
-    stream.seek(0x3c)
-    # read UInt32 little-endian
-    pe_header_ptr = unpack('<I', stream.read(4))[0]
+    buffer, offset = read_block(0x3c, _U32.size)
+    pe_header_ptr = _U32.unpack_from(buffer, offset)[0]
     if pe_header_ptr == 0:
         pe_header_ptr = 0x80
 
     if pe_header_ptr > length - 256:
         return None
 
-    stream.seek(pe_header_ptr)
-    # read UInt32 little-endian
-    pe_signature = unpack('<I', stream.read(4))[0]
-    if pe_signature != 0x00004550:
-        return None
-
-    # read UInt16 little-endian
-    machine = unpack('<H', stream.read(2))[0]
-    number_of_sections = unpack('<H', stream.read(2))[0]
+    buffer, offset = read_block(pe_header_ptr, _PE_HEADER.size)
 
-    # read UInt32 little-endian
-    timestamp = unpack('<I', stream.read(4))[0]
-    symbol_table_ptr = unpack('<I', stream.read(4))[0]
-    number_of_symbols = unpack('<I', stream.read(4))[0]
+    pe_signature, number_of_sections, optional_header_size, pe_format = _PE_HEADER.unpack_from(buffer, offset)
 
-    # read UInt16 little-endian
-    optional_header_size = unpack('<H', stream.read(2))[0]
-    characteristics = unpack('<H', stream.read(2))[0]
+    if pe_signature != 0x00004550:
+        return None
 
-    # read UInt16 little-endian
-    pe_format = PEFormat(unpack('<H', stream.read(2))[0])
+    pe_format = PEFormat(pe_format)
 
     if pe_format != PEFormat.PE32 and pe_format != PEFormat.PE32Plus:
         return None
 
-    stream.seek(pe_header_ptr + 232 if pe_format == PEFormat.PE32 else 248)
-
-    # read UInt32 little-endian
-    cli_header_rva = unpack('<I', stream.read(4))[0]
+    # offset of the CLI header data directory entry, the PE32+ optional header is 16 bytes larger
+    buffer, offset = read_block(pe_header_ptr + (232 if pe_format == PEFormat.PE32 else 248), _U32.size)
+    cli_header_rva = _U32.unpack_from(buffer, offset)[0]
 
     if cli_header_rva == 0:
         return None
 
     section_table_ptr = pe_header_ptr + 24 + optional_header_size
 
-    sections = []
-    for i in range(number_of_sections):
-        stream.seek(section_table_ptr + i * 40 + 8)
+    section_table_size = number_of_sections * _SECTION_ENTRY.size
 
-        virtual_size = unpack('<I', stream.read(4))[0]
-        virtual_address = unpack('<I', stream.read(4))[0]
-        stream.read(4)
-        pointer = unpack('<I', stream.read(4))[0]
+    buffer, offset = read_block(section_table_ptr, section_table_size)
+    section_table = buffer[offset:offset + section_table_size]
 
-        sections.append(_Section(virtual_size, virtual_address, pointer))
+    virtual_addresses = array('I')
+    virtual_sizes = array('I')
+    pointers = array('I')
 
-    cli_header_ptr = _resolve_rva(sections, cli_header_rva)
+    for virtual_size, virtual_address, pointer in _SECTION_ENTRY.iter_unpack(section_table):
+        virtual_addresses.append(virtual_address)
+        virtual_sizes.append(virtual_size)
+        pointers.append(pointer)
+
+    cli_header_ptr = _resolve_rva(virtual_addresses, virtual_sizes, pointers, cli_header_rva)
     if cli_header_ptr == 0:
         return None
 
-    stream.seek(cli_header_ptr + 4)
+    buffer, offset = read_block(cli_header_ptr + 4, _CLI_HEADER.size)
+
+    clr_header_major, clr_header_minor, corflags = _CLI_HEADER.unpack_from(buffer, offset)
 
-    # read UInt16 little-endian
-    clr_header_major = unpack('<H', stream.read(2))[0]
-    clr_header_minor = unpack('<H', stream.read(2))[0]
+    return CorFlags(clr_header_major, clr_header_minor, CorFlagsBits(corflags), pe_format)
 
-    # read UInt32 little-endian
-    metadata_rva = unpack('<I', stream.read(4))[0]
-    metadata_size = unpack('<I', stream.read(4))[0]
 
-    corflags = CorFlagsBits(unpack('<I', stream.read(4))[0])
+def read(stream):
+    """
+    Read :py:class:`msbuildpy.corflags.CorFlags` from a .NET assembly in a file stream.
+    
+    **None** is returned if the PE file is invalid.
+    
+    :param stream: A file stream that supports random access with **seek**
+    
+    :return: :py:class:`msbuildpy.corflags.CorFlags` or **None**
+    """
+
+    stream.seek(0, 2)
+    length = stream.tell()
+    stream.seek(0)
 
-    return CorFlags(clr_header_major, clr_header_minor, corflags, pe_format)
+    return _read(_stream_block_reader(stream), length)
 
 
 def read_file(filename):
     """
     Read :py:class:`msbuildpy.corflags.CorFlags` from a .NET assembly file path.
     
+    The file is memory mapped rather than read through a stream.
+    
     **None** is returned if the PE file is invalid.
     
     :param filename: A file path to a .NET assembly/executable.
@@ -308,4 +316,14 @@ def read_file(filename):
     """
 
     with open(filename, 'rb') as f:
-        return read(f)
+        length = os_fstat(f.fileno()).st_size
+
+        if length < 0x40:
+            # mmap cannot map an empty file
+            return None
+
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return _read(_mmap_block_reader(mm), length)
+        finally:
+            mm.close()
@@ -0,0 +1,133 @@
+# Copyright (c) 2017, Teriks
+#
+# msbuildpy is distributed under the following BSD 3-Clause License
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived
+#    from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON
+# ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Persistent cache for the results of probing tool binaries with a subprocess.
+
+Entries are keyed by binary path and stamped with the binary's modification
+time and size, so replacing/upgrading a tool invalidates its entry.
+
+Set the environmental variable MSBUILDPY_NO_CACHE=1 to disable the cache.
+"""
+
+import json
+import threading
+from os import environ as os_environ, \
+    stat as os_stat, \
+    makedirs as os_makedirs, \
+    replace as os_replace, \
+    getpid as os_getpid
+
+from os.path import join as path_join, \
+    expanduser as path_expanduser
+
+from time import time as time_now
+
+CACHE_DIR = path_join(path_expanduser('~'), '.cache', 'msbuildpy')
+
+CACHE_TTL = 60 * 60 * 24 * 7
+
+# serializes read-modify-write of the cache files between threads
+_STORE_LOCK = threading.Lock()
+
+
+def cache_enabled():
+    return os_environ.get('MSBUILDPY_NO_CACHE', '0') in ('', '0')
+
+
+def _binary_stamp(binary_path):
+    stat = os_stat(binary_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _cache_file(cache_name):
+    return path_join(CACHE_DIR, cache_name + '.json')
+
+
+def _load_entries(cache_name):
+    try:
+        with open(_cache_file(cache_name), 'r') as f:
+            entries = json.load(f)
+        if type(entries) is dict:
+            return entries
+    except (OSError, ValueError):
+        pass
+    return dict()
+
+
+def _store_entries(cache_name, entries):
+    try:
+        os_makedirs(CACHE_DIR, exist_ok=True)
+        file = _cache_file(cache_name)
+        temp_file = '{file}.{pid}.tmp'.format(file=file, pid=os_getpid())
+        with open(temp_file, 'w') as f:
+            json.dump(entries, f)
+        os_replace(temp_file, file)
+    except OSError:
+        pass
+
+
+def cached_probe(cache_name, binary_path, probe, dump, load):
+    """
+    Run **probe()** unless a fresh result for **binary_path** exists in the named cache.
+
+    :param cache_name: Name of the cache file, without extension.
+    :param binary_path: Path of the binary being probed, used as the key and stamp.
+    :param probe: A function accepting no arguments that produces the result.
+    :param dump: Converts the result into a JSON serializable value.
+    :param load: Converts a JSON value back into a result.
+    :return: The result of **probe()**, possibly loaded from the cache.  **None** results are never stored.
+    """
+
+    if not cache_enabled():
+        return probe()
+
+    try:
+        stamp = _binary_stamp(binary_path)
+    except OSError:
+        return probe()
+
+    entries = _load_entries(cache_name)
+    entry = entries.get(binary_path, None)
+
+    # the file may have been edited or written by another version, an entry
+    # of any unexpected shape is simply a miss
+
+    if type(entry) is dict and entry.get('stamp', None) == stamp:
+        try:
+            if time_now() - entry['time'] < CACHE_TTL:
+                return load(entry['value'])
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    result = probe()
+
+    if result is None:
+        # not found, or no banner this time, which may be a transient failure
+        return None
+
+    with _STORE_LOCK:
+        # reload, another probe may have stored its result in the meantime
+        entries = _load_entries(cache_name)
+        entries[binary_path] = {'stamp': stamp, 'time': time_now(), 'value': dump(result)}
+        _store_entries(cache_name, entries)
+
+    return result
@@ -1,45 +1,173 @@
 import re
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count, environ as os_environ
+from os.path import normcase as path_normcase, normpath as path_normpath
 
 from msbuildpy.searcher import ToolEntry
+from msbuildpy.private import disk_cache
+
+_MSBUILD_VER_PREFIX = b'Microsoft (R) Build Engine version '
 
 _MSBUILD_VER_REGEX = re.compile(
-    r'Microsoft \(R\) Build Engine version (?P<ver>[0-9]+(\.[0-9]+)*).*')
+    rb'\s*Microsoft \(R\) Build Engine version (?P<ver>[0-9]+(\.[0-9]+)*).*')
+
+_XBUILD_VER_PREFIX = b'XBuild Engine Version '
 
 _XBUILD_VER_REGEX = re.compile(
-    r'XBuild Engine Version (?P<ver>[0-9]+(\.[0-9]+)*)')
+    rb'\s*XBuild Engine Version (?P<ver>[0-9]+(\.[0-9]+)*)')
 
-MATCH_2VER_REGEX = re.compile('[0-9]+\.[0-9]+')
+MATCH_2VER_REGEX = re.compile(r'^[0-9]+\.[0-9]+$')
 
+# seconds to wait for a tool to print its version before giving up on it
+_PROBE_TIMEOUT = 30
 
-def parse_msbuild_ver_output(binary_path, arch, edition=None):
-    version_output = subprocess.check_output([binary_path,
-                                              '/version']).decode().strip()
-    match = _MSBUILD_VER_REGEX.match(version_output)
+
+def _dump_version(version):
+    return None if version is None else list(version)
+
+
+def _load_version(value):
+    return None if value is None else tuple(int(x) for x in value)
+
+
+def _parse_version_banner(output, prefix, regex):
+    # Fast path for the usual banner, a plain dotted version right after the prefix.
+    # Anything else (suffixes like '+commit', trailing dots) is left to the regex.
+
+    output = output.lstrip()
+
+    if output.startswith(prefix):
+        version = output[len(prefix):].split(None, 1)
+        if version:
+            parts = version[0].split(b'.')
+            if all(x.isdigit() for x in parts):
+                return tuple(int(x) for x in parts)
+
+    match = regex.match(output)
     if match:
-        version = tuple(int(x) for x in match.group('ver').split('.'))
-        return [ToolEntry(name='msbuild', version=version, arch=arch, edition=edition, path=binary_path)]
+        return tuple(int(x) for x in match.group('ver').split(b'.'))
+    return None
+
+
+# (normalized binary path, probe arguments, banner prefix) -> probed version, or None
+_PROBED_VERSIONS = dict()
+
+# one lock per key above, so that concurrent finders reaching the same
+# binary wait for the first probe instead of each spawning the tool
+_PROBE_LOCKS = dict()
+
+_PROBE_LOCKS_LOCK = threading.Lock()
+
+_NOT_PROBED = object()
+
+
+def _probe_once(key, probe):
+    # A binary that several finders discover (possibly spelled differently, and
+    # with a different arch or edition) is only probed once per process.
+
+    version = _PROBED_VERSIONS.get(key, _NOT_PROBED)
+    if version is not _NOT_PROBED:
+        return version
+
+    with _PROBE_LOCKS_LOCK:
+        key_lock = _PROBE_LOCKS.setdefault(key, threading.Lock())
+
+    with key_lock:
+        version = _PROBED_VERSIONS.get(key, _NOT_PROBED)
+        if version is _NOT_PROBED:
+            version = _PROBED_VERSIONS[key] = probe()
+        return version
+
+
+def _probe_version(cache_name, args, prefix, regex):
+    # a cache_name of None skips the disk cache
+
+    def probe():
+        # stdin is closed so a tool can never block waiting on input, and the
+        # exit code is ignored since only the version banner matters.
+        with subprocess.Popen(args,
+                              stdin=subprocess.DEVNULL,
+                              stdout=subprocess.PIPE,
+                              env=dict(os_environ, LANG='C')) as process:
+            try:
+                version_output = process.communicate(timeout=_PROBE_TIMEOUT)[0]
+            except subprocess.TimeoutExpired:
+                # do not leave a hung tool running behind, only wait for the tool itself
+                # since a child it started may still hold the output pipe open
+                process.kill()
+                process.wait()
+                raise
+
+        # the output is ASCII, parse the raw bytes and only convert the version
+        return _parse_version_banner(version_output, prefix, regex)
+
+    def probe_cached():
+        try:
+            if cache_name is None:
+                return probe()
+            return disk_cache.cached_probe(cache_name, args[0], probe, _dump_version, _load_version)
+        except subprocess.TimeoutExpired:
+            # treated as not found, but never cached on disk since the tool may just have been slow this once
+            return None
+
+    return _probe_once((path_normcase(path_normpath(args[0])), tuple(args[1:]), prefix), probe_cached)
+
+
+def clear_probe_cache():
+    """
+    Forget the memoized results of every parse_*_ver_output function.
+    """
+    with _PROBE_LOCKS_LOCK:
+        _PROBED_VERSIONS.clear()
+        _PROBE_LOCKS.clear()
+
+
+def parse_msbuild_ver_output(binary_path, arch, edition=None):
+    version = _probe_version('msbuild', [binary_path, '/version'], _MSBUILD_VER_PREFIX, _MSBUILD_VER_REGEX)
+    if version:
+        return (ToolEntry(name='msbuild', version=version, arch=arch, edition=edition, path=binary_path),)
     else:
-        return []
+        return ()
 
 
 def parse_dotnetcli_msbuild_ver_output(binary_path, arch, edition=None):
-    version_output = subprocess.check_output([binary_path, 'build',
-                                              '/version']).decode().strip()
-    match = _MSBUILD_VER_REGEX.match(version_output)
-    if match:
-        version = tuple(int(x) for x in match.group('ver').split('.'))
-        return [ToolEntry(name='dotnet build', version=version, arch=arch, edition=edition, path=binary_path)]
+    # not cached on disk, the version depends on the installed SDKs and on any global.json
+    # in the working directory, neither of which changes the dotnet binary's stamp
+
+    version = _probe_version(None, [binary_path, 'build', '/version'], _MSBUILD_VER_PREFIX, _MSBUILD_VER_REGEX)
+    if version:
+        return (ToolEntry(name='dotnet build', version=version, arch=arch, edition=edition, path=binary_path),)
     else:
-        return []
+        return ()
 
 
 def parse_xbuild_ver_output(binary_path, arch):
-    version_output = subprocess.check_output([binary_path, '/version']).decode().strip()
-
-    match = _XBUILD_VER_REGEX.match(version_output)
-    if match:
-        version = tuple(int(x) for x in match.group('ver').split('.'))
-        return [ToolEntry(name='xbuild', version=version, arch=arch, edition=None, path=binary_path)]
+    version = _probe_version('xbuild', [binary_path, '/version'], _XBUILD_VER_PREFIX, _XBUILD_VER_REGEX)
+    if version:
+        return (ToolEntry(name='xbuild', version=version, arch=arch, edition=None, path=binary_path),)
     else:
-        return []
+        return ()
+
+
+def parse_many(jobs):
+    """
+    Run several parse_*_ver_output calls concurrently, each one blocks on a subprocess.
+
+    :param jobs: Iterable of (parser, args) tuples, where args is a tuple of positional arguments for parser.
+    :return: A tuple of the ToolEntry objects returned by every job, in job order.  It is a tuple
+             since the default finders cache and share it between every search.
+    """
+
+    jobs = list(jobs)
+
+    if len(jobs) < 2:
+        return tuple(entry for parser, args in jobs for entry in parser(*args))
+
+    results = []
+    with ThreadPoolExecutor(max_workers=min(len(jobs), (cpu_count() or 1) * 2)) as executor:
+        futures = [executor.submit(parser, *args) for parser, args in jobs]
+        for future in futures:
+            results += future.result()
+    return tuple(results)
@@ -1,11 +1,22 @@
-import glob
 from importlib import import_module
-from os.path import dirname, basename, isfile
+from os import listdir
+from os.path import dirname, isfile, join
 
+from msbuildpy.sysinspect import is_windows
 
-modules = glob.glob(dirname(__file__) + "/*.py")
+# finder modules are prefixed by the platform they apply to,
+# the other platform's finders are never imported or registered.
 
-__all__ = [basename(f)[:-3] for f in modules if isfile(f)]
+_EXCLUDED_PREFIX = 'unix_' if is_windows() else 'win_'
+
+# modules are imported, and their finders registered, in sorted order so that
+# short circuited searches are repeatable
+
+_PACKAGE_DIR = dirname(__file__)
+
+__all__ = sorted(name[:-3] for name in listdir(_PACKAGE_DIR)
+                 if name.endswith('.py') and name != '__init__.py'
+                 and not name.startswith(_EXCLUDED_PREFIX) and isfile(join(_PACKAGE_DIR, name)))
 
 for i in ('.'+x for x in __all__):
     import_module(i, 'msbuildpy.private.finders')
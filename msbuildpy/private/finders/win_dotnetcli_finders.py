@@ -1,31 +1,33 @@
+from functools import lru_cache
+
 from os.path import join as path_join, \
     isfile as path_isfile
 
 from os import environ as os_environ
 
-from msbuildpy.private.finder_util import parse_dotnetcli_msbuild_ver_output
+from msbuildpy.private.finder_util import parse_dotnetcli_msbuild_ver_output, \
+    parse_many
 from msbuildpy.searcher import add_default_finder
-from msbuildpy.sysinspect import ARCH32, ARCH64, is_windows
+from msbuildpy.sysinspect import ARCH32, ARCH64
 
 
-def _win_dotnetcli_msbuild():
-    if not is_windows():
-        return None
+# dotnet.exe locations for each architecture, a variable is missing when its
+# Program Files folder does not exist (e.g. ProgramFiles(x86) on 32 bit Windows)
 
-    program_files = os_environ["ProgramW6432"]
-    program_files_x86 = os_environ["ProgramFiles(x86)"]
+_DOTNET_CLIS = tuple((path_join(os_environ[variable], 'dotnet', 'dotnet.exe'), arch)
+                     for variable, arch in (('ProgramW6432', ARCH64), ('ProgramFiles(x86)', ARCH32))
+                     if variable in os_environ)
 
-    cli1 = path_join(program_files, 'dotnet', 'dotnet.exe')
-    cli2 = path_join(program_files_x86, 'dotnet', 'dotnet.exe')
 
-    results = []
-    if path_isfile(cli1):
-        results += parse_dotnetcli_msbuild_ver_output(cli1, ARCH64)
+@lru_cache(maxsize=1)
+def _win_dotnetcli_msbuild():
+    jobs = []
 
-    if path_isfile(cli2):
-        results += parse_dotnetcli_msbuild_ver_output(cli2, ARCH32)
+    for cli, arch in _DOTNET_CLIS:
+        if path_isfile(cli):
+            jobs.append((parse_dotnetcli_msbuild_ver_output, (cli, arch)))
 
-    return results
+    return parse_many(jobs)
 
 
 add_default_finder(_win_dotnetcli_msbuild)
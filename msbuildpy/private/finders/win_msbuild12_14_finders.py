@@ -1,49 +1,41 @@
+from functools import lru_cache
+
 from os.path import join as path_join
 
 from msbuildpy.private.win_util import win_open_reg_key_hklm, \
-    win_enum_values_reg_key
+    win_get_value_reg_key
 
 from msbuildpy.searcher import add_default_finder
 
-from msbuildpy.sysinspect import ARCH32, ARCH64, is_windows
-
-from msbuildpy.private.finder_util import parse_msbuild_ver_output
+from msbuildpy.sysinspect import ARCH32, ARCH64
 
+from msbuildpy.private.finder_util import parse_msbuild_ver_output, \
+    parse_many
 
-def _win_msbuild_paths_12_14():
-    if not is_windows():
-        return None
 
-    versions = ['12.0', '14.0']
+# MSBuild 12.0 and 14.0 registry keys, paired with the architecture of the tools they point at
 
-    def filter_results(key, arch):
+_MSBUILD_KEYS = ((r'SOFTWARE\Microsoft\MSBuild\12.0', ARCH64),
+                 (r'SOFTWARE\WOW6432Node\Microsoft\MSBuild\12.0', ARCH32),
+                 (r'SOFTWARE\Microsoft\MSBuild\14.0', ARCH64),
+                 (r'SOFTWARE\WOW6432Node\Microsoft\MSBuild\14.0', ARCH32))
 
-        for key_name, key_value in win_enum_values_reg_key(key):
-            if key_name == 'MSBuildOverrideTasksPath':
-                return parse_msbuild_ver_output(path_join(key_value, r'MSBuild.exe'), arch)
 
-    results = []
+@lru_cache(maxsize=1)
+def _win_msbuild_paths_12_14():
+    jobs = []
 
-    for version in versions:
+    for msbuild_key, arch in _MSBUILD_KEYS:
         try:
-            with win_open_reg_key_hklm(
-                    r'SOFTWARE\Microsoft\MSBuild\{version}'.format(version=version)
-            ) as key:
-
-                results += filter_results(key, ARCH64)
+            with win_open_reg_key_hklm(msbuild_key) as key:
+                tasks_path = win_get_value_reg_key(key, 'MSBuildOverrideTasksPath')
         except OSError:
-            pass
-
-        try:
-            with win_open_reg_key_hklm(
-                    r'SOFTWARE\WOW6432Node\Microsoft\MSBuild\{version}'.format(version=version)
-            ) as key:
+            continue
 
-                results += filter_results(key, ARCH32)
-        except OSError:
-            pass
+        if tasks_path:
+            jobs.append((parse_msbuild_ver_output, (path_join(tasks_path, 'MSBuild.exe'), arch)))
 
-    return results
+    return parse_many(jobs)
 
 
 add_default_finder(_win_msbuild_paths_12_14)
@@ -1,3 +1,7 @@
+from functools import lru_cache
+
+from os import listdir
+
 from os.path import join as path_join, \
     sep as path_sep, \
     isdir as path_isdir, \
@@ -5,9 +9,10 @@ from os.path import join as path_join, \
     dirname as path_dirname, \
     normpath as path_normpath
 
-from msbuildpy.private.finder_util import parse_msbuild_ver_output
+from msbuildpy.private.finder_util import parse_msbuild_ver_output, \
+    parse_many
 
-from msbuildpy.private.win_util import win_values_dict_reg_key, \
+from msbuildpy.private.win_util import win_get_value_reg_key, \
     win_enum_keys_reg_key, \
     win_open_reg_key_hklm, \
     win_get_drive_letters
@@ -18,39 +23,45 @@ from msbuildpy.searcher import add_default_finder, \
     EDITION_STANDALONE, \
     EDITION_ENTERPRISE
 
-from msbuildpy.sysinspect import ARCH32, ARCH64, is_windows
+from msbuildpy.sysinspect import ARCH32, ARCH64
 
+_ARCH_SUBFOLDERS = (('', ARCH32), ('amd64\\', ARCH64))
+
+# MSBuild.exe paths relative to a Visual Studio 2017 install root, paired with their architecture
+
+_MSBUILD_EXES = tuple(('MSBuild\\15.0\\Bin\\' + sub_folder + 'MSBuild.exe', arch)
+                      for sub_folder, arch in _ARCH_SUBFOLDERS)
+
+# install folders of each VS 2017 edition, found beside the one registered under SxS\VS7
+
+_SXS_EDITIONS = (('BuildTools', EDITION_STANDALONE),
+                 ('Community', EDITION_COMMUNITY),
+                 ('Professional', EDITION_PROFESSIONAL),
+                 ('Enterprise', EDITION_ENTERPRISE))
+
+_STANDALONE_ROOTS = (':\\Program Files (x86)\\Microsoft Visual Studio\\2017\\BuildTools\\',
+                     ':\\Program Files\\Microsoft Visual Studio\\2017\\BuildTools\\')
 
-def _win_msbuild_paths_15_default_standalone_path():
-    if not is_windows():
-        return
 
-    results = []
+@lru_cache(maxsize=1)
+def _win_msbuild_paths_15_default_standalone_path():
+    jobs = []
 
     # This package does not have very descriptive registry entries
     # when it is installed by itself.  Check the default install path on all drives.
 
     for d_letter in win_get_drive_letters():
 
-        for folder_and_arch in [['', ARCH32], ['amd64\\', ARCH64]]:
-            sub_folder = folder_and_arch[0]
-            arch = folder_and_arch[1]
-
-            default = d_letter + ':\\Program Files (x86)\\Microsoft Visual ' \
-                                 'Studio\\2017\\BuildTools\\MSBuild\\15.0\\Bin\\{sub_folder}MSBuild.exe'.format(
-                sub_folder=sub_folder)
+        for msbuild_exe, arch in _MSBUILD_EXES:
 
-            if path_isfile(default):
-                results += parse_msbuild_ver_output(default, arch, edition=EDITION_STANDALONE)
+            for standalone_root in _STANDALONE_ROOTS:
 
-            default = d_letter + ':\\Program Files\\Microsoft Visual ' \
-                                 'Studio\\2017\\BuildTools\\MSBuild\\15.0\\Bin\\{sub_folder}MSBuild.exe'.format(
-                sub_folder=sub_folder)
+                default = d_letter + standalone_root + msbuild_exe
 
-            if path_isfile(default):
-                results += parse_msbuild_ver_output(default, arch, edition=EDITION_STANDALONE)
+                if path_isfile(default):
+                    jobs.append((parse_msbuild_ver_output, (default, arch, EDITION_STANDALONE)))
 
-    return results
+    return parse_many(jobs)
 
 
 add_default_finder(_win_msbuild_paths_15_default_standalone_path)
@@ -66,143 +77,130 @@ def _win_vs_2017_fingerprint_edition(install_root):
     return None
 
 
-def _win_msbuild_paths_15_read_app_id_reg_key(base_key, key):
-    for subkey in win_enum_keys_reg_key(key):
-        if not subkey.startswith('VisualStudio_'):
-            continue
-        try:
-            with win_open_reg_key_hklm(base_key + '\\' + subkey + '\\Capabilities') as cap_key:
+def _win_vs_2017_install_root(app_desc):
+    # ApplicationDescription looks like '@{install_root}\Common7\IDE\devenvdesc.dll,-1004',
+    # anything shaped differently, or a root that may need normalizing, is resolved the long way.
+    # A bare drive like 'C:' needs normalizing too, it is relative to the current directory on that drive
 
-                value_dict = win_values_dict_reg_key(cap_key)
+    parts = app_desc.lstrip('@').rsplit('\\', 3)
 
-                app_name = value_dict.get('ApplicationName', None)
+    if len(parts) == 4 and parts[1].lower() == 'common7' and parts[2].lower() == 'ide' \
+            and '\\.' not in parts[0] and '\\\\' not in parts[0] and '/' not in parts[0] \
+            and not parts[0].endswith(':'):
+        return parts[0]
 
-                if app_name and not app_name.startswith('Microsoft Visual Studio 2017'):
-                    continue
+    return path_normpath(path_join(app_desc.lstrip('@'), '..', '..', '..'))
 
-                app_desc = value_dict.get('ApplicationDescription', None)
 
-                if not app_desc:
-                    continue
+def _win_msbuild_paths_15_read_app_id_reg_key(base_key):
+    # The base key is only held open while its subkey names are listed, each
+    # Capabilities key is closed again before any MSBuild binary is probed.
 
-                install_root = path_normpath(path_join(app_desc.lstrip('@'), '..', '..', '..'))
+    try:
+        with win_open_reg_key_hklm(base_key) as key:
+            subkeys = [x for x in win_enum_keys_reg_key(key) if x.startswith('VisualStudio_')]
+    except OSError:
+        return None
 
-                edition = _win_vs_2017_fingerprint_edition(install_root)
+    jobs = []
 
-                for folder_and_arch in [['', ARCH32], ['amd64\\', ARCH64]]:
+    for subkey in subkeys:
+        try:
+            with win_open_reg_key_hklm(base_key + '\\' + subkey + '\\Capabilities') as cap_key:
+                app_name = win_get_value_reg_key(cap_key, 'ApplicationName')
+                app_desc = win_get_value_reg_key(cap_key, 'ApplicationDescription')
+        except OSError:
+            continue
 
-                    msbuild_dir = 'MSBuild\\15.0\\Bin\\{sub_folder}MSBuild.exe'.format(sub_folder=folder_and_arch[0])
-                    msbuild = path_join(install_root, msbuild_dir)
+        if app_name and not app_name.startswith('Microsoft Visual Studio 2017'):
+            continue
 
-                    if path_isfile(msbuild):
-                        result = parse_msbuild_ver_output(msbuild, folder_and_arch[1], edition=edition)
-                        if len(result):
-                            yield result[0]
+        if not app_desc:
+            continue
 
-        except OSError:
-            pass
+        install_root = _win_vs_2017_install_root(app_desc)
 
+        edition = _win_vs_2017_fingerprint_edition(install_root)
 
-def _win_msbuild_paths_15_by_app_id_x86_reg():
-    if not is_windows():
-        return
+        for msbuild_exe, arch in _MSBUILD_EXES:
+
+            msbuild = path_join(install_root, msbuild_exe)
+
+            if path_isfile(msbuild):
+                jobs.append((parse_msbuild_ver_output, (msbuild, arch, edition)))
+
+    return parse_many(jobs)
 
+
+@lru_cache(maxsize=1)
+def _win_msbuild_paths_15_by_app_id_x86_reg():
     # check the VisualStudio_{HASH} registry keys to try to derive
     # install locations from the devenvdesc.dll path
 
-    base_key = r'SOFTWARE\WOW6432Node\Microsoft'
-    try:
-        with win_open_reg_key_hklm(base_key) as key:
-            return list(_win_msbuild_paths_15_read_app_id_reg_key(base_key, key))
-    except OSError:
-        return None
-
-    return None
+    return _win_msbuild_paths_15_read_app_id_reg_key(r'SOFTWARE\WOW6432Node\Microsoft')
 
 
 add_default_finder(_win_msbuild_paths_15_by_app_id_x86_reg)
 
 
+@lru_cache(maxsize=1)
 def _win_msbuild_paths_15_by_app_id_x64_reg():
-    if not is_windows():
-        return
-
     # check the VisualStudio_{HASH} registry keys to try to derive
     # install locations from the devenvdesc.dll path
 
-    base_key = r'SOFTWARE\Microsoft'
-    try:
-        with win_open_reg_key_hklm(base_key) as key:
-            return list(_win_msbuild_paths_15_read_app_id_reg_key(base_key, key))
-    except OSError:
-        return None
-
-    return None
+    return _win_msbuild_paths_15_read_app_id_reg_key(r'SOFTWARE\Microsoft')
 
 
 add_default_finder(_win_msbuild_paths_15_by_app_id_x64_reg)
 
 
-def _win_msbuild_paths_15_read_sxs_reg_key(key):
-    reg_values = win_values_dict_reg_key(key)
-    path = reg_values.get('15.0', None)
-    results = []
+def _win_msbuild_paths_15_read_sxs_reg_key(vs7_key):
+    try:
+        with win_open_reg_key_hklm(vs7_key) as key:
+            path = win_get_value_reg_key(key, '15.0')
+    except OSError:
+        return None
+
+    jobs = []
 
     if path:
 
-        for folder_and_arch in [['', ARCH32], ['amd64\\', ARCH64]]:
+        common_dir = path_dirname(path.rstrip(path_sep))
 
-            msbuild_dir = 'MSBuild\\15.0\\Bin\\{sub_folder}MSBuild.exe'.format(sub_folder=folder_and_arch[0])
+        # one directory listing tells which editions are installed, folder names are case insensitive
 
-            arch = folder_and_arch[1]
+        try:
+            installed = set(name.lower() for name in listdir(common_dir)
+                            if path_isdir(path_join(common_dir, name)))
+        except OSError:
+            return None
 
-            common_dir = path_dirname(path.rstrip(path_sep))
+        editions = [(edition_dir, edition) for edition_dir, edition in _SXS_EDITIONS
+                    if edition_dir.lower() in installed]
 
-            # stand alone build tools
-            buildtools = path_join(common_dir, 'BuildTools', msbuild_dir)
-            if path_isfile(buildtools):
-                results += parse_msbuild_ver_output(buildtools, arch, edition=EDITION_STANDALONE)
+        for msbuild_exe, arch in _MSBUILD_EXES:
 
-            community = path_join(common_dir, 'Community', msbuild_dir)
-            if path_isfile(community):
-                results += parse_msbuild_ver_output(community, arch, edition=EDITION_COMMUNITY)
+            for edition_dir, edition in editions:
 
-            professional = path_join(common_dir, 'Professional', msbuild_dir)
-            if path_isfile(professional):
-                results += parse_msbuild_ver_output(professional, arch, edition=EDITION_PROFESSIONAL)
+                msbuild = path_join(common_dir, edition_dir, msbuild_exe)
 
-            enterprise = path_join(common_dir, 'Enterprise', msbuild_dir)
-            if path_isfile(enterprise):
-                results += parse_msbuild_ver_output(enterprise, arch, edition=EDITION_ENTERPRISE)
+                if path_isfile(msbuild):
+                    jobs.append((parse_msbuild_ver_output, (msbuild, arch, edition)))
 
-    return results
+    return parse_many(jobs)
 
 
+@lru_cache(maxsize=1)
 def _win_msbuild_paths_15_by_sxs_x64_reg():
-    if not is_windows():
-        return None
-
-    try:
-        with win_open_reg_key_hklm(r'SOFTWARE\Microsoft\VisualStudio\SxS\VS7') as key:
-
-            return _win_msbuild_paths_15_read_sxs_reg_key(key)
-    except OSError:
-        return None
+    return _win_msbuild_paths_15_read_sxs_reg_key(r'SOFTWARE\Microsoft\VisualStudio\SxS\VS7')
 
 
 add_default_finder(_win_msbuild_paths_15_by_sxs_x64_reg)
 
 
+@lru_cache(maxsize=1)
 def _win_msbuild_paths_15_by_sxs_x86_reg():
-    if not is_windows():
-        return None
-
-    try:
-        with win_open_reg_key_hklm(r'SOFTWARE\WOW6432Node\Microsoft\VisualStudio\SxS\VS7') as key:
-
-            return _win_msbuild_paths_15_read_sxs_reg_key(key)
-    except OSError:
-        return None
+    return _win_msbuild_paths_15_read_sxs_reg_key(r'SOFTWARE\WOW6432Node\Microsoft\VisualStudio\SxS\VS7')
 
 
 add_default_finder(_win_msbuild_paths_15_by_sxs_x86_reg)
@@ -1,71 +1,63 @@
-from glob import glob
+from functools import lru_cache
+
+from os import listdir
 
 from os.path import join as path_join, \
-    basename as path_basename, \
     sep as path_sep, \
-    isdir as path_isdir
+    isfile as path_isfile
 
 from msbuildpy.private.finder_util import parse_xbuild_ver_output, \
+    parse_many, \
     MATCH_2VER_REGEX
 
-from msbuildpy.private.win_util import win_values_dict_reg_key, \
+from msbuildpy.private.win_util import win_get_value_reg_key, \
     win_open_reg_key_hklm
 
 from msbuildpy.searcher import add_default_finder
 
-from msbuildpy.sysinspect import ARCH32, ARCH64, is_windows
-
-
-def _win_xbuild_path_x64():
-    if not is_windows():
-        return None
+from msbuildpy.sysinspect import ARCH32, ARCH64
 
-    try:
-        with win_open_reg_key_hklm(r'SOFTWARE\Mono') as key:
+_XBUILD_EXE_TAIL = path_sep + 'bin' + path_sep + 'xbuild.exe'
 
-            values = win_values_dict_reg_key(key)
-            install_root = values.get('SdkInstallRoot', None)
+_MONO_KEYS = ((r'SOFTWARE\Mono', ARCH64),
+              (r'SOFTWARE\WOW6432Node\Mono', ARCH32))
 
-            if install_root is None:
-                return None
 
-            dirs = path_join(install_root.strip(), 'lib', 'mono', 'xbuild', '*') + path_sep
-            results = []
+def _win_xbuild_jobs(install_root, arch):
+    jobs = []
 
-            for dir in (i for i in glob(dirs) if MATCH_2VER_REGEX.match(path_basename(i.rstrip(path_sep)))):
-                bin_dir = path_join(dir, 'bin')
-                if path_isdir(bin_dir):
-                    results += parse_xbuild_ver_output(path_join(dir, 'bin', 'xbuild.exe'), arch=ARCH64)
-            return results
-    except OSError:
-        return None
+    # version directories look like 'xbuild/14.0', names are matched
+    # first so only xbuild.exe itself needs a stat
 
+    xbuild_dir = path_join(install_root.strip(), 'lib', 'mono', 'xbuild')
 
-add_default_finder(_win_xbuild_path_x64)
+    for name in listdir(xbuild_dir):
+        if MATCH_2VER_REGEX.match(name):
+            xbuild = path_join(xbuild_dir, name) + _XBUILD_EXE_TAIL
+            if path_isfile(xbuild):
+                jobs.append((parse_xbuild_ver_output, (xbuild, arch)))
 
+    return jobs
 
-def _win_xbuild_path_x86():
-    if not is_windows():
-        return None
 
-    try:
-        with win_open_reg_key_hklm(r'SOFTWARE\WOW6432Node\Mono') as key:
+@lru_cache(maxsize=1)
+def _win_xbuild_paths():
+    # both Mono registrations are read in one pass and probed together,
+    # each registry key is closed before any xbuild binary is probed
 
-            values = win_values_dict_reg_key(key)
-            install_root = values.get('SdkInstallRoot', None)
-            if install_root is None: return None
+    jobs = []
 
-            dirs = path_join(install_root.strip(), 'lib', 'mono', 'xbuild', '*') + path_sep
-            results = []
+    for mono_key, arch in _MONO_KEYS:
+        try:
+            with win_open_reg_key_hklm(mono_key) as key:
+                install_root = win_get_value_reg_key(key, 'SdkInstallRoot')
 
-            for dir in (i for i in glob(dirs) if MATCH_2VER_REGEX.match(path_basename(i.rstrip(path_sep)))):
-                bin_dir = path_join(dir, 'bin')
-                if path_isdir(bin_dir):
-                    results += parse_xbuild_ver_output(path_join(dir, 'bin', 'xbuild.exe'), arch=ARCH32)
+            if install_root is not None:
+                jobs += _win_xbuild_jobs(install_root, arch)
+        except OSError:
+            continue
 
-            return results
-    except OSError:
-        return None
+    return parse_many(jobs)
 
 
-add_default_finder(_win_xbuild_path_x86)
+add_default_finder(_win_xbuild_paths)
@@ -31,21 +31,20 @@ from importlib import import_module
 
 
 def _env_msbuild_paths():
-    values = []
+    # Not cached, the environment may change between searches, so it can
+    # stream its entries to Searcher.find instead of building a list.
 
     msbuild = os_environ.get('MSBUILD_PATH', None)
     xbuild = os_environ.get('XBUILD_PATH', None)
 
     if msbuild:
         if path_basename(msbuild).lower() == 'dotnet':
-            values += finder_util.parse_dotnetcli_msbuild_ver_output(msbuild, ARCH32)
+            yield from finder_util.parse_dotnetcli_msbuild_ver_output(msbuild, ARCH32)
         else:
-            values += finder_util.parse_msbuild_ver_output(msbuild, ARCH32)
+            yield from finder_util.parse_msbuild_ver_output(msbuild, ARCH32)
 
     if xbuild:
-        values += finder_util.parse_xbuild_ver_output(xbuild, ARCH32)
-
-    return values
+        yield from finder_util.parse_xbuild_ver_output(xbuild, ARCH32)
 
 
 add_default_finder(_env_msbuild_paths)
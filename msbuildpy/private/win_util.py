@@ -20,51 +20,47 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 
-def win_get_drive_letters():
-    import string
-    from ctypes import windll
-    drives = []
-    bitmask = windll.kernel32.GetLogicalDrives()
-    for letter in string.ascii_uppercase:
-        if bitmask & 1:
-            drives.append(letter)
-        bitmask >>= 1
-    return drives
+from functools import lru_cache
 
+from msbuildpy.sysinspect import is_windows
 
-def win_enum_values_reg_key(key):
+# winreg and windll only exist on Windows, the win_ finders using these helpers are not imported elsewhere
+
+if is_windows():
     import winreg
+    from ctypes import windll
 
-    values = []
-    i = 0
-    try:
-        while True:
-            values.append(winreg.EnumValue(key, i))
-            i += 1
-    except OSError:
-        pass
-    return ((x[0], x[1]) for x in values)
+# GetDriveTypeW return value for hard disks and flash drives
+_DRIVE_FIXED = 3
 
 
-def win_enum_keys_reg_key(key):
-    import winreg
+@lru_cache(maxsize=1)
+def win_get_drive_letters():
+    # Only fixed drives are returned, probing removable media or a disconnected
+    # network share for files can block for seconds.
 
-    i = 0
-    try:
-        while True:
-            yield winreg.EnumKey(key, i)
-            i += 1
-    except OSError:
-        pass
+    drives = []
+    bitmask = windll.kernel32.GetLogicalDrives()
+    # visit only the set bits, lowest first, bit 0 is drive A
+    while bitmask:
+        bit = bitmask & -bitmask
+        letter = chr(ord('A') + bit.bit_length() - 1)
+        if windll.kernel32.GetDriveTypeW(letter + ':\\') == _DRIVE_FIXED:
+            drives.append(letter)
+        bitmask ^= bit
+    return tuple(drives)
 
 
-def win_values_dict_reg_key(key):
-    result = dict()
-    for pair in win_enum_values_reg_key(key):
-        result[pair[0]] = pair[1]
-    return result
+def win_enum_keys_reg_key(key):
+    return [winreg.EnumKey(key, i) for i in range(winreg.QueryInfoKey(key)[0])]
+
+
+def win_get_value_reg_key(key, name, default=None):
+    try:
+        return winreg.QueryValueEx(key, name)[0]
+    except FileNotFoundError:
+        return default
 
 
 def win_open_reg_key_hklm(path):
-    import winreg
     return winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path, 0, winreg.KEY_READ | winreg.KEY_WOW64_64KEY)
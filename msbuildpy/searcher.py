@@ -22,22 +22,36 @@
 
 import collections
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from importlib import import_module
+from operator import itemgetter
 
 from . import sysinspect
 from . import version
 
-_FILTER_REGEX = re.compile("""
-^
-(?P<name>[-a-zA-Z_ ]+)?\s+ # tool name
+_FILTER_REGEX = re.compile(r"""
+\A
+(?P<name>[-a-zA-Z_]+(?:[ ]+[-a-zA-Z_]+)*)?\s+ # tool name, words separated by spaces
 (?P<version_constraint>{version_constraint})? # version constraint
 (?:\s+(?P<arch_constraint>32bit|64bit))?   # space, then optional arch constraint
 (?:\s+(?P<edition_constraint>[a-zA-Z]+))?  # space, then optional edition constraint
-$
+\Z
 """.format(version_constraint=version.VERSION_CONSTRAINT_REGEX_STR), re.VERBOSE)
 
 _DEFAULT_FINDERS = []
 
+# the built in finders are imported on first use, not when msbuildpy is imported
+
+_BUILTIN_FINDERS_LOADED = False
+
+# reentrant, the built in finders call add_default_finder while the loader holds it
+
+_BUILTIN_FINDERS_LOCK = threading.RLock()
+
+_MAX_FINDER_THREADS = 8
+
 EDITION_COMMUNITY = 'community'
 """
 Signifies VS Community edition
@@ -78,16 +92,44 @@ class ToolEntry(collections.namedtuple('ToolEntry', ['name', 'version', 'arch',
     :var path: Full path to the binary, (a string).
     """
 
+    __slots__ = ()
+
 
 def add_default_finder(finder):
     """
     Add a default finder function.
     
-    Finder functions should return a list of :py:class:`msbuildpy.ToolEntry` objects, or **None**
+    Finder functions should return a list of :py:class:`msbuildpy.ToolEntry` objects, or **None**.
+    A generator of :py:class:`msbuildpy.ToolEntry` objects is also accepted.
     
     :param finder: A function accepting no arguments.
     """
-    _DEFAULT_FINDERS.append(finder)
+    with _BUILTIN_FINDERS_LOCK:
+        _DEFAULT_FINDERS.append(finder)
+
+
+def _load_builtin_finders():
+    global _BUILTIN_FINDERS_LOADED
+
+    if _BUILTIN_FINDERS_LOADED:
+        return
+
+    with _BUILTIN_FINDERS_LOCK:
+        if _BUILTIN_FINDERS_LOADED:
+            return
+
+        # the built in finders register themselves with add_default_finder as they are imported,
+        # they go ahead of any default finder that was added before they were loaded
+
+        added = list(_DEFAULT_FINDERS)
+        del _DEFAULT_FINDERS[:]
+
+        try:
+            import_module('msbuildpy.private.finders_entrypoint')
+        finally:
+            _DEFAULT_FINDERS.extend(added)
+
+        _BUILTIN_FINDERS_LOADED = True
 
 
 def get_default_finders():
@@ -98,9 +140,32 @@ def get_default_finders():
     
     :return: Copied list of default finder functions.
     """
+    _load_builtin_finders()
     return list(_DEFAULT_FINDERS)
 
 
+def clear_finder_caches():
+    """
+    Clear the results cached by the default finder functions.
+    
+    The default finders cache what they find for the life of the process, as do the
+    version probes they run.  Call this if tools have been installed or removed since the
+    last search, the next search will look for them again.
+    
+    Finders which are not cached (do not have a **cache_clear** attribute) are left alone.
+    """
+    for finder in _DEFAULT_FINDERS:
+        cache_clear = getattr(finder, 'cache_clear', None)
+        if cache_clear is not None:
+            cache_clear()
+
+    sysinspect.get_mono_vm.cache_clear()
+
+    import_module('msbuildpy.private.finder_util').clear_probe_cache()
+    import_module('msbuildpy.private.win_util').win_get_drive_letters.cache_clear()
+
+
+@lru_cache(maxsize=256)
 def _compile_single_ver_filter(v_filter):
     parsed_filter = _FILTER_REGEX.match(v_filter.strip())
 
@@ -113,24 +178,50 @@ def _compile_single_ver_filter(v_filter):
     f_arch_constraint = parsed_filter.group('arch_constraint')
     f_edition_constraint = parsed_filter.group('edition_constraint')
 
-    if f_version_constraint:
-        version_match = version.compile_matcher(f_version_constraint)
+    # everything is resolved here, once, so that the filter itself only compares
+
+    version_match = version.compile_matcher(f_version_constraint) if f_version_constraint else None
+
+    # a constraint made only of wildcards ('*', '*.*', ...) accepts every version, it is still
+    # compiled above so that syntax errors are raised, but it never needs to be called
+
+    if version_match is not None and not f_version_constraint.replace('*', '').replace('.', '').split():
+        version_match = None
+
+    # editions are documented as case insensitive, the built in finders report them in
+    # lower case but custom finders may not, so both sides are lowered
+    f_edition_constraint = f_edition_constraint.lower() if f_edition_constraint else None
+
+    # only the constraints actually given are checked, the name is not checked
+    # at all since compile_tool_filter only hands a filter entries with its name
+
+    # the string compares are cheaper than matching a version, so they go first
+
+    checks = []
+
+    if f_arch_constraint is not None:
+        checks.append(lambda tool_entry: tool_entry.arch == f_arch_constraint)
+
+    if f_edition_constraint is not None:
+        checks.append(lambda tool_entry: (tool_entry.edition or '').lower() == f_edition_constraint)
+
+    if version_match is not None:
+        checks.append(lambda tool_entry: version_match(tool_entry.version))
+
+    if not checks:
+        def _filter(tool_entry):
+            return False
+    elif len(checks) == 1:
+        check = checks[0]
 
         def _filter(tool_entry):
-            match = tool_entry.name == f_name and version_match(tool_entry.version)
-            if f_arch_constraint:
-                match = match and tool_entry.arch == f_arch_constraint
-            if f_edition_constraint:
-                match = match and tool_entry.edition == f_edition_constraint
-            return not match
+            return not check(tool_entry)
     else:
         def _filter(tool_entry):
-            match = tool_entry.name == f_name
-            if f_arch_constraint:
-                match = match and tool_entry.arch == f_arch_constraint
-            if f_edition_constraint:
-                match = match and tool_entry.edition == f_edition_constraint
-            return not match
+            for check in checks:
+                if not check(tool_entry):
+                    return True
+            return False
 
     return f_name, _filter
 
@@ -140,21 +231,16 @@ _VS_EDITION_PRIORITY_MAP = {
     'professional': 2,
     'enterprise': 3,
     'ultimate': 3,
-    'standalone': 4
+    'standalone': 4,
+    None: 5
 }
 
 
 def _vs_edition_priority(edition):
-    if edition is None:
-        return 5
+    # Slow path for editions missing from the map, custom finders may return
+    # them in any case.  Unknown editions sort last, along with None.
 
-    edition = edition.lower()
-
-    p = _VS_EDITION_PRIORITY_MAP.get(edition, None)
-    if p is not None:
-        return p
-
-    assert False, "Unknown edition string returned in search: {edition}".format(edition=edition)
+    return _VS_EDITION_PRIORITY_MAP.get(edition.lower(), 5)
 
 
 def compile_tool_filter(tool_filter):
@@ -163,41 +249,61 @@ def compile_tool_filter(tool_filter):
     
     See: :py:func:`msbuildpy.find_msbuild` for **tool_filter** examples.
     
+    Compiled filters are cached by their filter string, compiling the same string again is free.
+    
     :param tool_filter: Version filter string.
     :return: A function accepting a list of :py:class:`msbuildpy.ToolEntry` objects.
     """
-    filter_ors = tool_filter.strip().split('|')
+    return _compile_tool_filter(tool_filter.strip())
+
 
+@lru_cache(maxsize=128)
+def _compile_tool_filter(tool_filter):
     priorities = dict()
 
-    chain = []
+    # OR'd filters grouped by the tool name they apply to, an entry is only
+    # tested against the filters for its own name
 
-    for idx, filter_or in enumerate(filter_ors):
+    chains = dict()
+
+    for idx, filter_or in enumerate(tool_filter.split('|')):
         filter_name, compiled_filter = _compile_single_ver_filter(filter_or)
-        if filter_name not in priorities:
-            priorities[filter_name] = idx
-        chain.append(compiled_filter)
+        priorities.setdefault(filter_name, idx)
+        chains.setdefault(filter_name, []).append(compiled_filter)
 
     def _filter(entries):
+        # sort ascending by filter priority, descending by version, descending by arch bits (64bit first),
+        # the sort key of each entry is built once, as it is accepted
+
         output = []
         for entry in entries:
-            for v_filter in chain:
+            for v_filter in chains.get(entry.name, ()):
                 if not v_filter(entry):
-                    output.append(entry)
-
-        # sort ascending by filter priority, descending by version, descending by arch bits (64bit first)
-        output.sort(key=lambda l: (
-            priorities[l.name],
-            -(l.version[0] + l.version[1]),
-            0 if l.arch == sysinspect.ARCH64 else 1,
-            _vs_edition_priority(l.edition)
-        )
-                    )
-        return output
+                    output.append(((priorities[entry.name],
+                                    -sum(entry.version[:2]),
+                                    0 if entry.arch == sysinspect.ARCH64 else 1,
+                                    _VS_EDITION_PRIORITY_MAP.get(entry.edition) or
+                                    _vs_edition_priority(entry.edition)), entry))
+                    break
+
+        output.sort(key=itemgetter(0))
+        return [entry for key, entry in output]
 
     return _filter
 
 
+def _call_finder(finder):
+    # generator finders are drained here, in the worker thread, so that
+    # their probes overlap with the other finders
+
+    found = finder()
+    if found is None:
+        return ()
+    if isinstance(found, (list, tuple)):
+        return found
+    return list(found)
+
+
 class Searcher:
     """
     Tool searcher in object form.  Allows additional finders to be associated
@@ -222,7 +328,8 @@ class Searcher:
         """
         Add a finder function.
         
-        Finder functions should return a list of :py:class:`msbuildpy.ToolEntry` objects, or **None**
+        Finder functions should return a list of :py:class:`msbuildpy.ToolEntry` objects, or **None**.
+        A generator of :py:class:`msbuildpy.ToolEntry` objects is also accepted.
         
         :param finder: A function accepting no arguments.
         """
@@ -238,28 +345,49 @@ class Searcher:
         """
         return list(self._finders)
 
-    def find(self, tool_filter=None):
+    def find(self, tool_filter=None, short_circuit=False):
         """
         Find msbuild tools on the system using the finders in this Searcher object.
         
+        Finders are run concurrently in a thread pool unless **short_circuit** is set,
+        in which case they are run one at a time in the order they were added.
+        
         See: :py:func:`msbuildpy.find_msbuild` for **tool_filter** examples.
         
         :param tool_filter: Version filter string
+        :param short_circuit: Stop running finders once one of them has found a tool (that passes **tool_filter**
+                              if one is given), finders run in the order they were added.
     
         :return: A list of :py:class:`msbuildpy.ToolEntry` objects, which may be empty.
         """
-        values = set()
+        compiled_filter = compile_tool_filter(tool_filter) if tool_filter else None
 
-        for finder in self._finders:
-            found = finder()
-            if found:
-                values.update(found)
-        if tool_filter:
-            return compile_tool_filter(tool_filter)(values)
-        return list(values)
+        # entries are unique by path, when two finders report the same binary the one registered last wins,
+        # ordered so that entries the filter sorts as equal come back in finder order on every Python version
+
+        values = collections.OrderedDict()
+
+        if short_circuit or len(self._finders) < 2:
+            for finder in self._finders:
+                found = finder()
+                if found is not None:
+                    for entry in found:
+                        values[entry.path] = entry
+                    if short_circuit and values and (compiled_filter is None or compiled_filter(values.values())):
+                        break
+        else:
+            # finders mostly wait on subprocesses, the registry and the disk, so they can overlap
+            with ThreadPoolExecutor(max_workers=min(_MAX_FINDER_THREADS, len(self._finders))) as executor:
+                for found in executor.map(_call_finder, self._finders):
+                    for entry in found:
+                        values[entry.path] = entry
 
+        if compiled_filter:
+            return compiled_filter(values.values())
+        return list(values.values())
 
-def find_msbuild(tool_filter=None):
+
+def find_msbuild(tool_filter=None, short_circuit=False):
     """
         Find msbuild tools on the system, using an optional version filter.
     
@@ -315,6 +443,11 @@ def find_msbuild(tool_filter=None):
         
         find_msbuild('dotnet build 15.*')
         
+        # stop searching as soon as any matching tool is found, for instance one
+        # given by the MSBUILD_PATH environmental variable, which is checked first
+        
+        find_msbuild('msbuild >=14.*', short_circuit=True)
+        
         
     The version filter sorts the tool entries ascending by filter priority (their OR chain order),
     then descending by version, then descending by arch bits (64bit comes first), then ascending by edition.
@@ -329,12 +462,14 @@ def find_msbuild(tool_filter=None):
     Tools that report an edition of **None** or **'standalone'** have a higher value than named editions, so they
     come last in the output.
         
+    With **short_circuit=True** the search stops at the first finder which finds a tool that passes the
+    filter, instead of running every finder.  The result is then only what was found so far, which
+    is not necessarily the newest tool installed.
+        
     :param tool_filter: Version filter string
+    :param short_circuit: Stop searching once any tool passing **tool_filter** has been found.
     
     :return: A list of :py:class:`msbuildpy.ToolEntry` objects, which may be empty.
     """
 
-    return Searcher().find(tool_filter=tool_filter)
-
-
-import_module('msbuildpy.private.finders_entrypoint')
+    return Searcher().find(tool_filter=tool_filter, short_circuit=short_circuit)
@@ -27,12 +27,14 @@ Contains tools for inspecting system architecture/host OS, and finding mono VM's
 from functools import lru_cache
 from os.path import join as path_join
 from platform import system as platform_system, machine as platform_machine
-from re import compile as re_compile
-from subprocess import check_output as proc_check_output
+from re import compile as re_compile, MULTILINE as RE_MULTILINE
+from shutil import which as shutil_which
+from struct import calcsize as struct_calcsize
+from subprocess import check_output as proc_check_output, TimeoutExpired as ProcTimeoutExpired
 
 from collections import namedtuple
 
-from .private.win_util import win_values_dict_reg_key
+from .private import disk_cache
 
 ARCH32 = '32bit'
 """
@@ -59,25 +61,40 @@ _MACHINE_BITS_MAP = {
     'amd64': ARCH64,
     'ia64': ARCH64,
     'x86_64': ARCH64,
+    'aarch64': ARCH64,
+    'arm64': ARCH64,
     'i386': ARCH32,
-    'x86': ARCH32
+    'x86': ARCH32,
+    'armv7l': ARCH32
 }
 
 
 def _machine_bits_rest(machine):
-    try:
-        bits = proc_check_output(['getconf', 'LONG_BIT']).decode().strip()
-        if bits == '64':
-            return ARCH64
-        if bits == '32':
-            return ARCH32
-    except OSError:
-        pass
-
+    # Fall back to the pointer size of the running interpreter,
+    # this avoids spawning 'getconf LONG_BIT' for unmapped machine types.
+    bits = struct_calcsize('P') * 8
+    if bits == 64:
+        return ARCH64
+    if bits == 32:
+        return ARCH32
+
+    # Only reached for pointer sizes other than 32 or 64 bits, the arch is then
+    # unknown and is_32bit, is_64bit, get_arch and get_mono_vm given an explicit
+    # arch raise NotImplementedError.
     return None
 
 
-_MONO_OUTPUT_ARCH_REGEX = re_compile('Architecture:\s*(?P<arch>.+)')
+_ARCH = _MACHINE_BITS_MAP.get(_MACHINE, None) or _machine_bits_rest(_MACHINE)
+
+
+# the value ends at the first whitespace, so a trailing '\r' or padding never hides it from _MONO_ARCH_MAP
+
+_MONO_OUTPUT_ARCH_REGEX = re_compile(rb'^[ \t]*Architecture:[ \t]*(?P<arch>\S+)', RE_MULTILINE)
+
+_MONO_OUTPUT_VERSION_REGEX = re_compile(rb'Mono \S+ compiler version (?P<ver>[0-9]+(?:\.[0-9]+)*)')
+
+# seconds to wait for 'mono --version' before giving up on the VM
+_MONO_PROBE_TIMEOUT = 30
 
 _MONO_ARCH_MAP = {
     'amd64': ARCH64,
@@ -89,10 +106,6 @@ _MONO_ARCH_MAP = {
 }
 
 
-def _mono_arch_rest(ver_architecure):
-    return ARCH64 if is_64bit() else ARCH32
-
-
 def is_windows():
     """
     Test if the underlying OS is Windows.
@@ -147,7 +160,6 @@ def is_netbsd():
     return _ON_NETBSD
 
 
-@lru_cache(maxsize=None)
 def is_32bit():
     """
     Test if the underlying OS/Machine is 32bit.
@@ -155,18 +167,12 @@ def is_32bit():
     :return: bool
     """
 
-    bits = _MACHINE_BITS_MAP.get(_MACHINE, None)
-    if bits:
-        return bits == ARCH32
+    if _ARCH is None:
+        raise NotImplementedError('unknown machine type')
 
-    bits = _machine_bits_rest(_MACHINE)
-    if bits:
-        return bits == ARCH32
-
-    raise NotImplementedError('unknown machine type')
+    return _ARCH == ARCH32
 
 
-@lru_cache(maxsize=None)
 def is_64bit():
     """
     Test if the underlying OS/Machine is 64bit.
@@ -174,15 +180,10 @@ def is_64bit():
     :return: bool
     """
 
-    bits = _MACHINE_BITS_MAP.get(_MACHINE, None)
-    if bits:
-        return bits == ARCH64
+    if _ARCH is None:
+        raise NotImplementedError('unknown machine type')
 
-    bits = _machine_bits_rest(_MACHINE)
-    if bits:
-        return bits == ARCH32
-
-    raise NotImplementedError('unknown machine type')
+    return _ARCH == ARCH64
 
 
 def get_arch():
@@ -192,24 +193,31 @@ def get_arch():
     :return: :py:const:`msbuildpy.sysinspect.ARCH64` or :py:const:`msbuildpy.sysinspect.ARCH32`
     """
 
-    return ARCH32 if is_32bit() else ARCH64
+    if _ARCH is None:
+        raise NotImplementedError('unknown machine type')
+
+    return _ARCH
 
 
 class MonoVm(namedtuple('MonoVm', ['version', 'arch', 'path'])):
     """
     Represents a Mono VM binary, with version, architecture and binary path.
     
-    :var version: Version tuple (major, minor, patch)
+    :var version: Version tuple of varying size (major, minor, ...), every component the VM reports
     :var arch: Architecture, :py:const:`msbuildpy.sysinspect.ARCH64` or :py:const:`msbuildpy.sysinspect.ARCH32`
     :var path: Full path to the binary, (a string).
     """
 
+    __slots__ = ()
+
 
 def _win_read_mono_vm_from_registry_key(key, arch):
-    values = win_values_dict_reg_key(key)
-    install_root = values.get('SdkInstallRoot', None)
-    version = values.get('Version', None)
-    if install_root is None or version is None: return None
+    import winreg
+    try:
+        install_root = winreg.QueryValueEx(key, 'SdkInstallRoot')[0]
+        version = winreg.QueryValueEx(key, 'Version')[0]
+    except FileNotFoundError:
+        return None
 
     return MonoVm(
         tuple(int(i) for i in version.split('.')),
@@ -240,31 +248,86 @@ def _win_get_mono_vm_x86():
         return None
 
 
-def _other_get_mono_vm():
+def _other_probe_mono_vm(path):
     try:
-        version = proc_check_output(["mono", "--version"]).decode()
+        version = proc_check_output([path, "--version"], timeout=_MONO_PROBE_TIMEOUT)
+
+        version_match = _MONO_OUTPUT_VERSION_REGEX.search(version)
+
+        if version_match is None:
+            return None
 
         arch_match = _MONO_OUTPUT_ARCH_REGEX.search(version)
 
         if arch_match is None:
-            arch = ARCH64 if is_64bit() else ARCH32
+            arch = _ARCH
         else:
-            arch = arch_match.group('arch')
-
-            arch = _MONO_ARCH_MAP.get(arch, None)
+            arch = _MONO_ARCH_MAP.get(arch_match.group('arch').decode(), _ARCH)
 
-            if arch is None:
-                arch = _mono_arch_rest(arch)
-
-        version = version[26:]
-        version = tuple(int(i) for i in version[:version.find(' ')].split("."))
-        path = proc_check_output(['which', 'mono']).decode().strip()
+        version = tuple(int(i) for i in version_match.group('ver').split(b'.'))
 
         return MonoVm(version, arch, path)
     except OSError:
         return None
 
 
+def _dump_mono_vm(vm):
+    return None if vm is None else [list(vm.version), vm.arch, vm.path]
+
+
+def _load_mono_vm(value):
+    return None if value is None else MonoVm(tuple(int(i) for i in value[0]), value[1], value[2])
+
+
+def _other_get_mono_vm():
+    mono = shutil_which('mono')
+    if mono is None:
+        return None
+
+    try:
+        return disk_cache.cached_probe('mono', mono, lambda: _other_probe_mono_vm(mono), _dump_mono_vm, _load_mono_vm)
+    except ProcTimeoutExpired:
+        return None
+
+
+def _win_get_mono_vm():
+    r = _win_get_mono_vm_x64()
+    if r is None:
+        return _win_get_mono_vm_x86()
+    return r
+
+
+def _no_mono_vm():
+    return None
+
+
+def _unknown_arch_mono_vm():
+    # an explicit arch can not be checked against an unknown machine type
+    raise NotImplementedError('unknown machine type')
+
+
+# get_mono_vm's 'arch' argument -> finder function, decided once for the host OS and architecture
+
+if _ON_WINDOWS:
+    _MONO_VM_FINDERS = {
+        None: _win_get_mono_vm,
+        ARCH32: _win_get_mono_vm_x86,
+        ARCH64: _win_get_mono_vm_x64
+    }
+elif _ARCH is None:
+    _MONO_VM_FINDERS = {
+        None: _other_get_mono_vm,
+        ARCH32: _unknown_arch_mono_vm,
+        ARCH64: _unknown_arch_mono_vm
+    }
+else:
+    _MONO_VM_FINDERS = {
+        None: _other_get_mono_vm,
+        ARCH32: _no_mono_vm if _ARCH == ARCH64 else _other_get_mono_vm,
+        ARCH64: _no_mono_vm if _ARCH == ARCH32 else _other_get_mono_vm
+    }
+
+
 @lru_cache(maxsize=None)
 def get_mono_vm(arch=None):
     """
@@ -277,24 +340,5 @@ def get_mono_vm(arch=None):
     
     :return: :py:class:`msbuildpy.sysinspect.MonoVm` or **None**
     """
-    if arch is None:
-        if is_windows():
-            r = _win_get_mono_vm_x64()
-            if r is None:
-                return _win_get_mono_vm_x86()
-            return r
-        return _other_get_mono_vm()
-
-    if arch == ARCH32:
-        if is_windows():
-            return _win_get_mono_vm_x86()
-        if is_64bit():
-            return None
-        return _other_get_mono_vm()
 
-    if arch == ARCH64:
-        if is_windows():
-            return _win_get_mono_vm_x64()
-        if is_32bit():
-            return None
-        return _other_get_mono_vm()
+    return _MONO_VM_FINDERS.get(arch, _no_mono_vm)()
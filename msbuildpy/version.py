@@ -26,6 +26,7 @@ Version string matcher function compilation
 
 import functools
 import re
+from itertools import islice
 
 
 class VersionFilterSyntaxError(Exception):
@@ -40,11 +41,20 @@ class VersionFilterSyntaxError(Exception):
 _OP_REGEX_STR = '(?:<=|>=|<|>)'
 _COMPONENT_REGEX_STR = '(?:[0-9]+|\*)'
 
-_REMOVE_SPACE_REGEX = re.compile(r"\s+", flags=re.UNICODE)
+
+def _remove_space(string):
+    # str.split() with no separator splits on the same characters as a unicode \s
+    return ''.join(string.split())
+
+
+# Every run of whitespace belongs to exactly one \s*, and a component is a single character
+# class, so the engine never has two ways to split the same text.  A nested quantifier such
+# as ([0-9]+|\*)+, or two \s* around an optional operator, backtracks exponentially on input
+# that does not match.
 
 VERSION_CONSTRAINT_REGEX_STR = \
-    '{ver_ops}?\s*{component}+\s*(?:{ver_ops}\s*[0-9]+)?\s*(?:\.\s*{ver_ops}?\s*{component}+\s*(?:{ver_ops}\s*[0-9]+)?)*' \
-        .format(ver_ops=_OP_REGEX_STR, component=_COMPONENT_REGEX_STR)
+    r'(?:{ver_ops}\s*)?[0-9*]+(?:\s*{ver_ops}\s*[0-9]+)?(?:\s*\.\s*(?:{ver_ops}\s*)?[0-9*]+(?:\s*{ver_ops}\s*[0-9]+)?)*' \
+        .format(ver_ops=_OP_REGEX_STR)
 """
 A string containing a regex which matches a version constraint expression used by :py:func:`msbuildpy.version.compile_matcher`.
 The regex in the string does not have ^$ anchors.
@@ -57,34 +67,22 @@ _VERSION_CONSTRAINT_COMPONENT_REGEX = re.compile("""
 """.format(ver_ops=_OP_REGEX_STR, component=_COMPONENT_REGEX_STR), re.VERBOSE)
 
 
-def _op_lt(l, r):
-    return l < r
-
-
-def _op_gt(l, r):
-    return l > r
-
-
-def _op_lte(l, r):
-    return l <= r
+# operator -> the reflected comparison method of the constraint's int, so that
+# 'in_component < constraint' is the C level bound method constraint.__gt__
 
-
-def _op_gte(l, r):
-    return l >= r
-
-
-_OPERATORS = {
-    '<': _op_lt,
-    '>': _op_gt,
-    '<=': _op_lte,
-    '>=': _op_gte
+_REFLECTED_OPERATORS = {
+    '<': '__gt__',
+    '>': '__lt__',
+    '<=': '__ge__',
+    '>=': '__le__'
 }
 
 
-def _get_operator(operator):
-    return _OPERATORS[operator]
+def _get_operator(op, constraint_component):
+    return getattr(constraint_component, _REFLECTED_OPERATORS[op])
 
 
+@functools.lru_cache(maxsize=256)
 def compile_matcher(version_constraint):
     """
     Compile a function from a version constraint expression which will match a version tuple
@@ -205,15 +203,20 @@ def compile_matcher(version_constraint):
         print(matcher('13.10.5.5'))  # -> True
         
     
+    Compiled matchers are cached by their constraint string, compiling the same string again is free.
+    
     :param version_constraint: Version constraint string, or tuple/list of version components (they get cast to int)
     :return: A function accepting a version string, or an iterable of version components (they get cast to int)
     """
 
-    version_constraint = _REMOVE_SPACE_REGEX.sub("", version_constraint)
+    version_constraint = _remove_space(version_constraint)
     version_constraint = version_constraint.split('.')
+
+    # (component index, matcher function), wildcard components always match and get no entry
+
     matcher_functions = []
 
-    for constraint_str in version_constraint:
+    for index, constraint_str in enumerate(version_constraint):
 
         constraint = _VERSION_CONSTRAINT_COMPONENT_REGEX.match(constraint_str)
         if not constraint:
@@ -233,35 +236,22 @@ def compile_matcher(version_constraint):
                         .format(filter=constraint_str)
                 )
 
-            matcher_functions.append(lambda in_component: True)
             continue
         else:
             c_component = int(c_component)
 
-        if c_op_two_arg:
-            c_op_two_arg = int(c_op_two_arg)
-
         if c_op_one and c_op_two:
-            op_one = _get_operator(c_op_one)
-            op_two = _get_operator(c_op_two)
+            op_one = _get_operator(c_op_one, c_component)
+            op_two = _get_operator(c_op_two, int(c_op_two_arg))
 
             # curry
-            def _create_matcher(constraint_component, constraint_op_two_arg):
-                return lambda in_component: op_one(in_component, constraint_component) and op_two(in_component,
-                                                                                                  constraint_op_two_arg)
+            def _create_matcher(op_one, op_two):
+                return lambda in_component: op_one(in_component) and op_two(in_component)
 
-            matcher_functions.append(_create_matcher(c_component, c_op_two_arg))
-
-            continue
+            matcher_functions.append((index, _create_matcher(op_one, op_two)))
 
         elif c_op_one:
-            op = _get_operator(c_op_one)
-
-            # curry
-            def _create_matcher(constraint_component):
-                return lambda in_component: op(in_component, constraint_component)
-
-            matcher_functions.append(_create_matcher(c_component))
+            matcher_functions.append((index, _get_operator(c_op_one, c_component)))
 
         elif c_op_two:
             raise VersionFilterSyntaxError(
@@ -269,26 +259,47 @@ def compile_matcher(version_constraint):
                 'Offending filter: {filter}'.format(filter=constraint_str)
             )
         else:
+            matcher_functions.append((index, c_component.__eq__))
 
-            # curry
-            def _create_matcher(constraint_component):
-                return lambda in_component: in_component == constraint_component
+    matcher_functions = tuple(matcher_functions)
+
+    # components past the last non wildcard constraint can never fail a match
 
-            matcher_functions.append(_create_matcher(c_component))
+    len_components = matcher_functions[-1][0] + 1 if matcher_functions else 0
+
+    if len(matcher_functions) == 1 and len_components == 1:
+        # the common 'N', '>=N' or 'N.*' shape, only the major version is ever looked at
+
+        major_matcher = matcher_functions[0][1]
+
+        def _match_major(version):
+            if type(version) is str:
+                return major_matcher(int(_remove_space(version).split('.', 1)[0]))
+            return major_matcher(int(next(iter(version), 0)))
+
+        return _match_major
 
     def _match(version):
+        if not len_components:
+            return True
+
+        # components past the last constraint are ignored, so they are never converted
+
         if type(version) is str:
-            version = [int(i) for i in _REMOVE_SPACE_REGEX.sub("", version).split('.')]
+            version = [int(i) for i in
+                       _remove_space(version).split('.', len_components)[:len_components]]
         else:
-            version = [int(i) for i in version]
+            version = [int(i) for i in islice(version, len_components)]
 
         len_version = len(version)
-        len_matcher_functions = len(matcher_functions)
 
-        if len_version < len_matcher_functions:
+        if len_version < len_components:
             # treat missing components as 0
-            version += [0 for i in range(len_matcher_functions - len_version)]
+            version.extend((0,) * (len_components - len_version))
 
-        return functools.reduce(lambda l, r: l and r[0](r[1]), zip(matcher_functions, version), True)
+        for index, matcher_function in matcher_functions:
+            if not matcher_function(version[index]):
+                return False
+        return True
 
     return _match
@@ -0,0 +1,96 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+
+from msbuildpy import corflags
+from msbuildpy.corflags import PEFormat, AssemblyArchitecture, CorFlagsBits
+
+
+def _build_pe(flags, clr_major=2, clr_minor=5, pe_format=PEFormat.PE32):
+    # Minimal PE image containing a single section which holds the CLI header.
+
+    image = bytearray(0x400)
+
+    pe_header_ptr = 0x80
+
+    if pe_format == PEFormat.PE32:
+        optional_header_size = 0xE0
+        cli_directory_offset = 232
+    else:
+        optional_header_size = 0xF0
+        cli_directory_offset = 248
+
+    struct.pack_into('<I', image, 0x3c, pe_header_ptr)
+
+    struct.pack_into('<IHHIIIHHH', image, pe_header_ptr,
+                     0x00004550, 0x14c, 1, 0, 0, 0, optional_header_size, 0x2102, pe_format.value)
+
+    # CLI header data directory entry
+    struct.pack_into('<I', image, pe_header_ptr + cli_directory_offset, 0x2008)
+
+    # section table: name, virtual size, virtual address, size of raw data, pointer to raw data
+    struct.pack_into('<8sIIII', image, pe_header_ptr + 24 + optional_header_size,
+                     b'.text', 0x1000, 0x2000, 0x200, 0x200)
+
+    # CLI header at rva 0x2008 -> file offset 0x208
+    struct.pack_into('<IHHIII', image, 0x208, 0x48, clr_major, clr_minor, 0, 0, flags)
+
+    return bytes(image)
+
+
+class TestCorFlags(unittest.TestCase):
+    def test_read(self):
+        flags = corflags.read(io.BytesIO(_build_pe(CorFlagsBits.ILOnly | CorFlagsBits.StrongNameSigned)))
+
+        self.assertIsNotNone(flags)
+        self.assertEqual(flags.pe_format, PEFormat.PE32)
+        self.assertTrue(flags.is_pure_il)
+        self.assertTrue(flags.is_signed)
+        self.assertEqual(flags.processor_architecture, AssemblyArchitecture.MSIL)
+        self.assertEqual(flags.clr_header, (2, 5))
+        self.assertEqual(flags.corflags.value, CorFlagsBits.ILOnly | CorFlagsBits.StrongNameSigned)
+        self.assertEqual(int(flags.corflags), flags.corflags.value)
+
+        flags = corflags.read(io.BytesIO(_build_pe(CorFlagsBits.ILOnly | CorFlagsBits.F32BitsRequired)))
+
+        self.assertFalse(flags.is_signed)
+        self.assertEqual(flags.processor_architecture, AssemblyArchitecture.X86)
+
+        flags = corflags.read(io.BytesIO(_build_pe(0)))
+
+        self.assertFalse(flags.is_pure_il)
+        self.assertEqual(flags.processor_architecture, AssemblyArchitecture.X86)
+
+    def test_read_pe32plus(self):
+        flags = corflags.read(io.BytesIO(_build_pe(CorFlagsBits.ILOnly, pe_format=PEFormat.PE32Plus)))
+
+        self.assertIsNotNone(flags)
+        self.assertEqual(flags.pe_format, PEFormat.PE32Plus)
+        self.assertTrue(flags.is_pure_il)
+        self.assertEqual(flags.processor_architecture, AssemblyArchitecture.X64)
+
+    def test_read_invalid(self):
+        self.assertIsNone(corflags.read(io.BytesIO(b'')))
+        self.assertIsNone(corflags.read(io.BytesIO(bytes(0x400))))
+
+    def test_read_file(self):
+        fd, filename = tempfile.mkstemp(suffix='.dll')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_build_pe(CorFlagsBits.ILOnly))
+
+            flags = corflags.read_file(filename)
+
+            self.assertTrue(flags.is_pure_il)
+            self.assertEqual(flags.processor_architecture, AssemblyArchitecture.MSIL)
+        finally:
+            os.remove(filename)
+
+    def test_resolve_rva_unsorted_sections(self):
+        # the section table of a malformed file may not be in ascending order
+
+        self.assertEqual(corflags._resolve_rva([0x4000, 0x2000], [0x1000, 0x1000], [0x400, 0x200], 0x2008), 0x208)
+        self.assertEqual(corflags._resolve_rva([0x2000, 0x4000], [0x1000, 0x1000], [0x200, 0x400], 0x4008), 0x408)
+        self.assertEqual(corflags._resolve_rva([0x4000, 0x2000], [0x1000, 0x1000], [0x400, 0x200], 0x3008), 0)
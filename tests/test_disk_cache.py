@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from msbuildpy.private import disk_cache
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+        fd, self.binary = tempfile.mkstemp(dir=self.cache_dir, suffix='.exe')
+        with os.fdopen(fd, 'w') as f:
+            f.write('tool')
+
+        patcher = mock.patch.object(disk_cache, 'CACHE_DIR', self.cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.dict(os.environ, {'MSBUILDPY_NO_CACHE': '0'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+        self.probes = 0
+
+    def _probe(self, result=(15, 1)):
+        def probe():
+            self.probes += 1
+            return result
+
+        return disk_cache.cached_probe('test', self.binary, probe, list, tuple)
+
+    def _write_cache(self, entries):
+        with open(os.path.join(self.cache_dir, 'test.json'), 'w') as f:
+            json.dump(entries, f)
+
+    def test_hit(self):
+        self.assertEqual(self._probe(), (15, 1))
+        self.assertEqual(self._probe(), (15, 1))
+        self.assertEqual(self.probes, 1)
+
+    def test_stamp_changed(self):
+        self._probe()
+
+        with open(self.binary, 'a') as f:
+            f.write('upgraded')
+
+        self.assertEqual(self._probe((16, 0)), (16, 0))
+        self.assertEqual(self.probes, 2)
+
+    def test_ttl_expired(self):
+        self._probe()
+
+        with mock.patch.object(disk_cache, 'time_now', lambda: 10 ** 12):
+            self._probe()
+
+        self.assertEqual(self.probes, 2)
+
+    def test_disabled(self):
+        with mock.patch.dict(os.environ, {'MSBUILDPY_NO_CACHE': '1'}):
+            self._probe()
+            self._probe()
+
+        self.assertEqual(self.probes, 2)
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, 'test.json')))
+
+    def test_none_not_stored(self):
+        self.assertIsNone(self._probe(None))
+        self.assertEqual(self._probe(), (15, 1))
+        self.assertEqual(self.probes, 2)
+
+    def test_corrupt(self):
+        with open(os.path.join(self.cache_dir, 'test.json'), 'w') as f:
+            f.write('{not json')
+
+        self.assertEqual(self._probe(), (15, 1))
+
+        # wrongly shaped files and entries are a miss, never an error
+
+        stamp = disk_cache._binary_stamp(self.binary)
+
+        for entries in ([], {self.binary: []}, {self.binary: 'entry'},
+                        {self.binary: {'stamp': stamp, 'time': 'now', 'value': [15, 1]}},
+                        {self.binary: {'stamp': stamp, 'value': [15, 1]}},
+                        {self.binary: {'stamp': stamp, 'time': disk_cache.time_now(), 'value': 15}}):
+            self._write_cache(entries)
+            self.probes = 0
+            self.assertEqual(self._probe(), (15, 1))
+            self.assertEqual(self.probes, 1)
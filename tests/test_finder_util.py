@@ -0,0 +1,66 @@
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from msbuildpy.private import finder_util
+
+
+class _FakeProcess:
+    def __init__(self, stdout):
+        self.stdout = stdout
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def communicate(self, timeout=None):
+        return self.stdout, None
+
+
+class TestFinderUtil(unittest.TestCase):
+    def setUp(self):
+        finder_util.clear_probe_cache()
+        self.addCleanup(finder_util.clear_probe_cache)
+
+        patcher = mock.patch.dict(os.environ, {'MSBUILDPY_NO_CACHE': '1'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.calls = []
+        self.calls_lock = threading.Lock()
+
+    def _popen(self, args, **kwargs):
+        with self.calls_lock:
+            self.calls.append(args)
+        time.sleep(0.05)
+        return _FakeProcess(b'Microsoft (R) Build Engine version 15.1.548.43366\n')
+
+    def test_probe_once(self):
+        with mock.patch.object(finder_util.subprocess, 'Popen', self._popen):
+            standalone = finder_util.parse_msbuild_ver_output('/vs/MSBuild.exe', '64bit', edition='standalone')
+            unknown = finder_util.parse_msbuild_ver_output('/vs/./MSBuild.exe', '64bit')
+
+        # the same binary reached with another edition or spelling is not probed again
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(standalone[0].edition, 'standalone')
+        self.assertEqual(unknown[0].edition, None)
+        self.assertEqual(unknown[0].version, (15, 1, 548, 43366))
+        self.assertEqual(unknown[0].path, '/vs/./MSBuild.exe')
+
+    def test_probe_once_concurrent(self):
+        # finders running at the same time wait for the first probe of a binary
+
+        with mock.patch.object(finder_util.subprocess, 'Popen', self._popen):
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                results = list(executor.map(
+                    lambda edition: finder_util.parse_msbuild_ver_output('/vs/MSBuild.exe', '64bit', edition),
+                    ['standalone', None, 'community']))
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual([r[0].edition for r in results], ['standalone', None, 'community'])
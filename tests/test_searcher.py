@@ -0,0 +1,126 @@
+import unittest
+
+from msbuildpy.searcher import ToolEntry, Searcher, compile_tool_filter
+from msbuildpy.version import VersionFilterSyntaxError
+
+_ENTRIES = [
+    ToolEntry('msbuild', (15, 1, 1012, 6693), '64bit', 'community', 'msbuild15_64_community'),
+    ToolEntry('msbuild', (15, 1, 1012, 6693), '32bit', 'community', 'msbuild15_32_community'),
+    ToolEntry('msbuild', (15, 1, 1012, 6693), '64bit', 'enterprise', 'msbuild15_64_enterprise'),
+    ToolEntry('msbuild', (14, 0, 25123, 0), '64bit', None, 'msbuild14_64'),
+    ToolEntry('msbuild', (14, 0, 25123, 0), '32bit', None, 'msbuild14_32'),
+    ToolEntry('xbuild', (14, 0), '64bit', None, 'xbuild14_64'),
+    ToolEntry('xbuild', (12, 0), '64bit', None, 'xbuild12_64'),
+    ToolEntry('dotnet build', (15, 1, 1012, 6693), '64bit', None, 'dotnet15_64'),
+]
+
+
+def _find(tool_filter):
+    return [entry.path for entry in compile_tool_filter(tool_filter)(_ENTRIES)]
+
+
+class TestSearcher(unittest.TestCase):
+    def test_compile_tool_filter(self):
+        self.assertEqual(_find('msbuild 14.*'), ['msbuild14_64', 'msbuild14_32'])
+
+        self.assertEqual(_find('msbuild 15.* 32bit'), ['msbuild15_32_community'])
+
+        self.assertEqual(_find('xbuild >=12<14.*'), ['xbuild12_64'])
+
+        self.assertEqual(_find('dotnet build *.*'), ['dotnet15_64'])
+
+        # descending by version, 64bit first, then ascending by edition
+
+        self.assertEqual(_find('msbuild *.*'), ['msbuild15_64_community',
+                                                'msbuild15_64_enterprise',
+                                                'msbuild15_32_community',
+                                                'msbuild14_64',
+                                                'msbuild14_32'])
+
+    def test_compile_tool_filter_edition(self):
+        self.assertEqual(_find('msbuild 15.* enterprise'), ['msbuild15_64_enterprise'])
+
+        # edition is not case sensitive
+
+        self.assertEqual(_find('msbuild 15.* 64bit Community'), ['msbuild15_64_community'])
+
+        # custom finders may report editions in any case
+
+        entries = [ToolEntry('msbuild', (16, 0), '64bit', 'Community', 'msbuild16_custom')]
+
+        self.assertEqual(compile_tool_filter('msbuild 16 Community')(entries), entries)
+        self.assertEqual(compile_tool_filter('msbuild 16 community')(entries), entries)
+
+    def test_compile_tool_filter_or(self):
+        # tools are ordered by their first appearance in the OR chain
+
+        self.assertEqual(_find('xbuild 14.* | msbuild 14.* 64bit'), ['xbuild14_64', 'msbuild14_64'])
+
+        self.assertEqual(_find('msbuild 14.* 64bit | xbuild 14.*'), ['msbuild14_64', 'xbuild14_64'])
+
+        # an entry matching more than one OR'd filter is only returned once
+
+        self.assertEqual(_find('msbuild 14.* 64bit | msbuild >=14.* 64bit'), ['msbuild15_64_community',
+                                                                              'msbuild15_64_enterprise',
+                                                                              'msbuild14_64'])
+
+    def test_compile_tool_filter_syntax_error(self):
+        with self.assertRaises(VersionFilterSyntaxError):
+            compile_tool_filter('msbuild 15.* 128bit')
+
+        with self.assertRaises(VersionFilterSyntaxError):
+            compile_tool_filter('msbuild 3<=5')
+
+        # these used to backtrack exponentially before failing
+
+        with self.assertRaises(VersionFilterSyntaxError):
+            compile_tool_filter('msbuild ' + '1' * 50 + '!')
+
+        with self.assertRaises(VersionFilterSyntaxError):
+            compile_tool_filter('msbuild ' + '1 . ' * 50 + 'x')
+
+    def test_find_dedup_by_path(self):
+        searcher = Searcher(use_default_finders=False)
+
+        # the same binary reported by two finders is only returned once, the later finder wins
+
+        searcher.add_finder(lambda: [ToolEntry('msbuild', (14, 0), '32bit', None, 'msbuild14')])
+        searcher.add_finder(lambda: [ToolEntry('msbuild', (14, 0), '64bit', None, 'msbuild14'),
+                                     ToolEntry('xbuild', (14, 0), '64bit', None, 'xbuild14')])
+
+        self.assertEqual(sorted(searcher.find()), [ToolEntry('msbuild', (14, 0), '64bit', None, 'msbuild14'),
+                                                   ToolEntry('xbuild', (14, 0), '64bit', None, 'xbuild14')])
+
+    def test_find_short_circuit(self):
+        called = []
+
+        def first():
+            return [ToolEntry('msbuild', (15, 1), '64bit', None, 'msbuild15')]
+
+        def second():
+            called.append(second)
+            return [ToolEntry('msbuild', (14, 0), '64bit', None, 'msbuild14')]
+
+        searcher = Searcher(use_default_finders=False)
+        searcher.add_finder(first)
+        searcher.add_finder(second)
+
+        # unfiltered, any tool found stops the search
+
+        self.assertEqual([e.path for e in searcher.find(short_circuit=True)], ['msbuild15'])
+        self.assertEqual(called, [])
+
+        # filtered, only a tool passing the filter stops the search
+
+        self.assertEqual([e.path for e in searcher.find('msbuild 15.*', short_circuit=True)], ['msbuild15'])
+        self.assertEqual(called, [])
+
+        self.assertEqual([e.path for e in searcher.find('msbuild 14.*', short_circuit=True)], ['msbuild14'])
+        self.assertEqual(called, [second])
+
+        # without short_circuit every finder runs
+
+        del called[:]
+
+        self.assertEqual([e.path for e in searcher.find()], ['msbuild15', 'msbuild14'])
+        self.assertEqual(called, [second])
@@ -58,6 +58,13 @@ class TestStringMethods(unittest.TestCase):
         self.assertTrue(matcher('12.1.5.5'))  # -> True
         self.assertTrue(matcher('13.10.5.5'))  # -> True
 
+        # Each component keeps its own operators
+
+        matcher = compile_matcher('>0.*.<3.<1')
+        self.assertTrue(matcher('3'))  # -> True
+        self.assertTrue(matcher((3, 9, 2, 0)))  # -> True
+        self.assertFalse(matcher((0, 9, 2, 0)))  # -> False
+
         # Do not allow the secondary operator against a version
         # component to be used alone.
 